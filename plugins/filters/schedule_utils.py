@@ -7,17 +7,123 @@
 # https://docs.ansible.com/ansible/latest/dev_guide/developing_plugins.html#developing-filter-plugins
 
 """ Ansible filter for comparing dates with today"""
-from datetime import datetime, timedelta
-import operator
-import unittest
-import re
+from datetime import date, datetime
+import functools
+from operator import eq, ge, gt, le, lt, ne
+import time
+from typing import Tuple
+
+# (monotonic timestamp, now without microseconds, today)
+_NOW_CACHE: Tuple[float, datetime, date] = (
+    float("-inf"),
+    datetime.min,
+    date.min,
+)
+_NOW_TTL = 0.5
+
+_OPS = {
+    "==": eq,
+    ">": gt,
+    ">=": ge,
+    "<=": le,
+    "<": lt,
+    "!=": ne,
+}
+
+
+def _d2(datestring: str, i: int) -> int:
+    """Return the two ASCII digits at position i as an integer."""
+    return (ord(datestring[i]) - 48) * 10 + ord(datestring[i + 1]) - 48
+
+
+def _d4(datestring: str, i: int) -> int:
+    """Return the four ASCII digits at position i as an integer."""
+    return _d2(datestring, i) * 100 + _d2(datestring, i + 2)
+
+
+def _valid_date10(datestring: str) -> bool:
+    """Checks if $datestring has the format YYYY-mm-dd."""
+    # isdigit() also accepts non-ASCII digits, which _d2/_d4 can't handle.
+    return (
+        datestring.isascii()
+        and datestring[4] == "-"
+        and datestring[7] == "-"
+        and datestring[:4].isdigit()
+        and datestring[5:7].isdigit()
+        and datestring[8:10].isdigit()
+    )
+
+
+def _valid_date19(datestring: str) -> bool:
+    """Checks if $datestring has the format YYYY-mm-dd(T| )HH:MM:SS."""
+    return (
+        _valid_date10(datestring)
+        and datestring[10] in ("T", " ")
+        and datestring[13] == ":"
+        and datestring[16] == ":"
+        and datestring[11:13].isdigit()
+        and datestring[14:16].isdigit()
+        and datestring[17:19].isdigit()
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse(datestring: str) -> date:
+    """Parse $datestring(YYYY-mm-dd[(T| )HH:MM:SS]) into a date or datetime.
+    Playbooks tend to check the same few dates over and over again,
+    so the results are cached.
+    """
+    length = len(datestring)
+    if length == 10 and _valid_date10(datestring):
+        return date(_d4(datestring, 0), _d2(datestring, 5), _d2(datestring, 8))
+    if length == 19 and _valid_date19(datestring):
+        return datetime(
+            _d4(datestring, 0),
+            _d2(datestring, 5),
+            _d2(datestring, 8),
+            _d2(datestring, 11),
+            _d2(datestring, 14),
+            _d2(datestring, 17),
+        )
+    raise ValueError(f"Invalid datestring: {datestring!r}")
+
+
+def _now() -> Tuple[datetime, date]:
+    """Return the current datetime (without microseconds) and date.
+    Refreshed at most every _NOW_TTL seconds, as a playbook loop calls
+    the filters far more often than that.
+    """
+    global _NOW_CACHE  # pylint: disable=W0603
+    timestamp = time.monotonic()
+    cache = _NOW_CACHE
+    if timestamp - cache[0] > _NOW_TTL:
+        now = datetime.today()
+        cache = (timestamp, now.replace(microsecond=0), now.date())
+        _NOW_CACHE = cache
+    return cache[1], cache[2]
+
+
+def _predicate(name, compare, doc):
+    """Return a staticmethod filter checking compare(check_date, now_date)."""
+
+    def predicate(datestring):
+        now_date, check_date = FilterModule._get(datestring)
+        return compare(check_date, now_date)
+
+    predicate.__name__ = name
+    predicate.__qualname__ = f"FilterModule.{name}"
+    predicate.__doc__ = doc
+    return staticmethod(predicate)
 
 
 class FilterModule:
     """Ansible Module for adding custom filters."""
 
-    # pylint: disable=R0201
-    def get_dates(self, datestring):
+    # No __slots__ here: ansible's plugin loader sets attributes like
+    # _load_name and _original_path on the instance it creates.
+
+    @staticmethod
+    def get_dates(datestring):
         """Return a dictionary with datetime objects.
         Either with or without times. In any case with a date.
         input:
@@ -28,288 +134,58 @@ class FilterModule:
               'now_date': $now(YYYY-mm-dd[ HH:MM:SS],
               'check_date': $datesting(YYYY-mm-dd[ HH:MM:SS])
           }
-        """
-        dates = {}
-        pattern = r"^\d{4}-\d{2}\-\d{2}$"
-        if re.match(pattern, datestring):
-            dates["now_date"] = datetime.today().date()
-            dates["check_date"] = datetime.strptime(
-                datestring, "%Y-%m-%d"
-            ).date()
-
-        pattern = r"^\d{4}-\d{2}\-\d{2}T\d{2}:\d{2}:\d{2}$"
-        if re.match(pattern, datestring):
-            dates["now_date"] = datetime.today().replace(microsecond=0)
-            dates["check_date"] = datetime.strptime(
-                datestring, "%Y-%m-%dT%H:%M:%S"
-            )
-
-        pattern = r"^\d{4}-\d{2}\-\d{2} \d{2}:\d{2}:\d{2}$"
-        if re.match(pattern, datestring):
-            dates["now_date"] = datetime.today().replace(microsecond=0)
-            dates["check_date"] = datetime.strptime(
-                datestring, "%Y-%m-%d %H:%M:%S"
-            )
-        return dates
 
-    def is_due(self, datestring, date_operator=None):
+        raises:
+          ValueError if $datestring does not match the format above.
+        """
+        now_date, check_date = FilterModule._get(datestring)
+        return {"now_date": now_date, "check_date": check_date}
+
+    @staticmethod
+    def _get(datestring):
+        """Same as get_dates, but returns the tuple (now_date, check_date)."""
+        check_date = _parse(datestring)
+        now_datetime, now_date = _now()
+        if len(datestring) == 10:
+            return now_date, check_date
+        return now_datetime, check_date
+
+    @staticmethod
+    def is_due(datestring, date_operator=None):
         """Checks if a given datestring fulfills the operator
         requirements compared to today
         """
-        if not date_operator:
-            date_operator = "=="
-        ops = {
-            "==": operator.eq,
-            ">": operator.gt,
-            ">=": operator.ge,
-            "<=": operator.le,
-            "<": operator.lt,
-            "!=": operator.ne,
-        }
-        check_date = self.get_dates(datestring)["check_date"]
-        now_date = self.get_dates(datestring)["now_date"]
-        return ops[date_operator](now_date, check_date)
-
-    def is_past(self, datestring):
-        """Checks if a given datestring lies in the past."""
-        check_date = self.get_dates(datestring)["check_date"]
-        now_date = self.get_dates(datestring)["now_date"]
-        if check_date < now_date:
-            return True
-        return False
-
-    def is_today_or_past(self, datestring):
-        """Checks if a given datestring is either today or lies in the past."""
-        check_date = self.get_dates(datestring)["check_date"]
-        now_date = self.get_dates(datestring)["now_date"]
-        if check_date <= now_date:
-            return True
-        return False
-
-    def is_future(self, datestring):
-        """Checks if a given datestring is in the future."""
-        check_date = self.get_dates(datestring)["check_date"]
-        now_date = self.get_dates(datestring)["now_date"]
-        if check_date > now_date:
-            return True
-        return False
-
-    def is_today_or_future(self, datestring):
-        """Checks if a given datestring is in the future or today."""
-        check_date = self.get_dates(datestring)["check_date"]
-        now_date = self.get_dates(datestring)["now_date"]
-        if check_date >= now_date:
-            return True
-        return False
-
-    def is_today(self, datestring):
-        """Checks if a given datestring is today."""
-        check_date = self.get_dates(datestring)["check_date"]
-        now_date = self.get_dates(datestring)["now_date"]
-        if check_date == now_date:
-            return True
-        return False
+        now_date, check_date = FilterModule._get(datestring)
+        return _OPS[date_operator or "=="](now_date, check_date)
+
+    is_past = _predicate(
+        "is_past", lt, "Checks if a given datestring lies in the past."
+    )
+    is_today_or_past = _predicate(
+        "is_today_or_past",
+        le,
+        "Checks if a given datestring is either today or lies in the past.",
+    )
+    is_future = _predicate(
+        "is_future", gt, "Checks if a given datestring is in the future."
+    )
+    is_today_or_future = _predicate(
+        "is_today_or_future",
+        ge,
+        "Checks if a given datestring is in the future or today.",
+    )
+    is_today = _predicate(
+        "is_today", eq, "Checks if a given datestring is today."
+    )
 
+    # pylint: disable=R0201
     def filters(self):
         """Ties the filtername to the corresponding method."""
         return {
-            "is_due": self.is_due,
-            "is_future": self.is_future,
-            "is_past": self.is_past,
-            "is_today_or_future": self.is_today_or_future,
-            "is_today_or_past": self.is_today_or_past,
-            "is_today": self.is_today,
+            "is_due": FilterModule.is_due,
+            "is_future": FilterModule.is_future,
+            "is_past": FilterModule.is_past,
+            "is_today_or_future": FilterModule.is_today_or_future,
+            "is_today_or_past": FilterModule.is_today_or_past,
+            "is_today": FilterModule.is_today,
         }
-
-
-# ---
-
-
-class TestStringUtlisFunctions(unittest.TestCase):
-    """Tests for the ansible plugin."""
-
-    def setUp(self):
-        """Setup method to run before each test."""
-        self.filter = FilterModule()
-        self.date_today = str(datetime.today().date())
-        self.date_today_wt = str(datetime.today().now().replace(microsecond=0))
-        self.date_yesterday = str(
-            (datetime.today() - timedelta(days=1)).date()
-        )
-        self.date_yesterday_wt = str(
-            ((datetime.now() - timedelta(days=1)).replace(microsecond=0))
-        )
-        self.date_tomorrow = str((datetime.today() + timedelta(days=1)).date())
-        self.date_tomorrow_wt = str(
-            ((datetime.now() + timedelta(days=1)).replace(microsecond=0))
-        )
-
-    def test_get_dates_without_time(self):
-        """Return dict with two dates: now and the requested one."""
-        result = self.filter.get_dates("1970-01-01")
-        self.assertEqual(
-            result["check_date"],
-            datetime.strptime("1970-01-01", "%Y-%m-%d").date(),
-        )
-        self.assertEqual(
-            result["now_date"],
-            datetime.strptime(self.date_today, "%Y-%m-%d").date(),
-        )
-
-    def test_get_dates_with_time(self):
-        """Return dict with two dates: now and the requested one."""
-        # Removing the microseconds from this timestamp.
-        time_now = str(datetime.today().replace(microsecond=0))
-
-        # Test with a 'T' instead of a whitespace
-        result = self.filter.get_dates("1970-01-01T01:01:01")
-        self.assertEqual(
-            result["check_date"],
-            datetime.strptime("1970-01-01 01:01:01", "%Y-%m-%d %H:%M:%S"),
-        )
-        self.assertEqual(
-            result["now_date"],
-            datetime.strptime(time_now, "%Y-%m-%d %H:%M:%S"),
-        )
-
-        # Test with a space instead of a 'T'
-        result = self.filter.get_dates("1970-01-01T01:01:01")
-        self.assertEqual(
-            result["check_date"],
-            datetime.strptime("1970-01-01 01:01:01", "%Y-%m-%d %H:%M:%S"),
-        )
-
-        self.assertEqual(
-            result["now_date"],
-            datetime.strptime(time_now, "%Y-%m-%d %H:%M:%S"),
-        )
-
-    def test_is_past(self):
-        """Verify correct output from is_past"""
-        self.assertTrue(self.filter.is_past(self.date_yesterday))
-        self.assertFalse(self.filter.is_past(self.date_today))
-        self.assertFalse(self.filter.is_past(self.date_tomorrow))
-
-    def test_is_past_wtime(self):
-        """Verify correct outout from is_past with time"""
-        self.assertFalse(self.filter.is_past(self.date_tomorrow_wt))
-        self.assertFalse(self.filter.is_past(self.date_today_wt))
-        self.assertTrue(self.filter.is_past(self.date_yesterday_wt))
-
-    def test_is_today_or_past(self):
-        """Verify correct output fromn is_today_an_past"""
-        self.assertTrue(self.filter.is_today_or_past(self.date_today))
-        self.assertTrue(self.filter.is_today_or_past(self.date_yesterday))
-        self.assertFalse(self.filter.is_today_or_past(self.date_tomorrow))
-
-    def test_is_today_or_past_wt(self):
-        """Verify correct output fromn is_today_an_past"""
-        self.assertTrue(self.filter.is_today_or_past(self.date_today_wt))
-        self.assertTrue(self.filter.is_today_or_past(self.date_yesterday_wt))
-        self.assertFalse(self.filter.is_today_or_past(self.date_tomorrow_wt))
-
-    def test_is_future(self):
-        """Verify correct output from future day"""
-        self.assertFalse(self.filter.is_future(self.date_today))
-        self.assertFalse(self.filter.is_future(self.date_yesterday))
-        self.assertTrue(self.filter.is_future(self.date_tomorrow))
-
-    def test_is_today_or_future(self):
-        """Verify correct output from today and future"""
-        self.assertTrue(self.filter.is_today_or_future(self.date_today))
-        self.assertFalse(self.filter.is_today_or_future(self.date_yesterday))
-        self.assertTrue(self.filter.is_today_or_future(self.date_tomorrow))
-
-    def test_is_future_wt(self):
-        """Verify correct output from future day with time"""
-        self.assertFalse(self.filter.is_future(self.date_today_wt))
-        self.assertFalse(self.filter.is_future(self.date_yesterday_wt))
-        self.assertTrue(self.filter.is_future(self.date_tomorrow_wt))
-
-    def test_is_today(self):
-        """Verify correct output from today only"""
-        self.assertTrue(self.filter.is_today(self.date_today))
-        self.assertFalse(self.filter.is_today(self.date_yesterday))
-        self.assertFalse(self.filter.is_today(self.date_tomorrow))
-
-    def test_is_today_wt(self):
-        """Verify correct output from today only"""
-        self.assertTrue(self.filter.is_today(self.date_today_wt))
-        self.assertFalse(self.filter.is_today(self.date_yesterday_wt))
-        self.assertFalse(self.filter.is_today(self.date_tomorrow_wt))
-
-    def test_is_due_eq(self):
-        """Verify the return for due with todays date."""
-        self.assertTrue(
-            self.filter.is_due(self.date_today, date_operator="==")
-        )
-        self.assertFalse(
-            self.filter.is_due(self.date_tomorrow, date_operator="==")
-        )
-        self.assertFalse(
-            self.filter.is_due(self.date_yesterday, date_operator="==")
-        )
-
-    def test_is_due_gt(self):
-        """Verify the return for due with greater than"""
-        self.assertFalse(
-            self.filter.is_due(self.date_today, date_operator=">")
-        )
-        self.assertFalse(
-            self.filter.is_due(self.date_tomorrow, date_operator=">")
-        )
-        self.assertTrue(
-            self.filter.is_due(self.date_yesterday, date_operator=">")
-        )
-
-    def test_is_due_ge(self):
-        """Verify the return for due with greater-equal than"""
-        self.assertTrue(
-            self.filter.is_due(self.date_today, date_operator=">=")
-        )
-        self.assertFalse(
-            self.filter.is_due(self.date_tomorrow, date_operator=">=")
-        )
-        self.assertTrue(
-            self.filter.is_due(self.date_yesterday, date_operator=">=")
-        )
-
-    def test_is_due_le(self):
-        """Verify the return for due with less-equal than"""
-        self.assertTrue(
-            self.filter.is_due(self.date_today, date_operator="<=")
-        )
-        self.assertTrue(
-            self.filter.is_due(self.date_tomorrow, date_operator="<=")
-        )
-        self.assertFalse(
-            self.filter.is_due(self.date_yesterday, date_operator="<=")
-        )
-
-    def test_is_due_lt(self):
-        """Verify the return for due with less than"""
-        self.assertFalse(
-            self.filter.is_due(self.date_today, date_operator="<")
-        )
-        self.assertTrue(
-            self.filter.is_due(self.date_tomorrow, date_operator="<")
-        )
-        self.assertFalse(
-            self.filter.is_due(self.date_yesterday, date_operator="<")
-        )
-
-    def test_is_due_ne(self):
-        """Verify the return for due with less than"""
-        self.assertFalse(
-            self.filter.is_due(self.date_today, date_operator="!=")
-        )
-        self.assertTrue(
-            self.filter.is_due(self.date_tomorrow, date_operator="!=")
-        )
-        self.assertTrue(
-            self.filter.is_due(self.date_yesterday, date_operator="!=")
-        )
-
-
-if __name__ == "__main__":
-    unittest.main()
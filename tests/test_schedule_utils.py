@@ -0,0 +1,241 @@
+"""Tests for the schedule_utils ansible filter plugin."""
+from datetime import date, datetime, timedelta
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(__file__), "..", "plugins", "filters")
+)
+
+# pylint: disable=C0413
+import schedule_utils  # noqa: E402
+from schedule_utils import FilterModule  # noqa: E402
+
+
+class TestStringUtlisFunctions(unittest.TestCase):
+    """Tests for the ansible plugin."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Setup method to run once before all tests."""
+        cls.filter = FilterModule()
+        today = datetime.today()
+        cls.date_today = str(today.date())
+        cls.date_yesterday = str((today - timedelta(days=1)).date())
+        cls.date_tomorrow = str((today + timedelta(days=1)).date())
+
+    def setUp(self):
+        """Setup method to run before each test."""
+        # Don't let a "now" cached by an earlier test leak into this one.
+        schedule_utils._NOW_CACHE = (float("-inf"), datetime.min, date.min)
+        # The *_wt values have one-second resolution and are compared
+        # against the live clock, so they are taken right before each test.
+        now = datetime.today().replace(microsecond=0)
+        self.date_today_wt = str(now)
+        self.date_yesterday_wt = str(now - timedelta(days=1))
+        self.date_tomorrow_wt = str(now + timedelta(days=1))
+
+    def test_now_cache_ttl(self):
+        """Reuse now within _NOW_TTL seconds and refresh it afterwards."""
+        ttl = schedule_utils._NOW_TTL
+        with mock.patch("time.monotonic", return_value=100.0):
+            now = schedule_utils._now()
+        with mock.patch("time.monotonic", return_value=100.0 + ttl):
+            self.assertIs(schedule_utils._now()[0], now[0])
+        with mock.patch("time.monotonic", return_value=100.1 + ttl):
+            self.assertIsNot(schedule_utils._now()[0], now[0])
+            self.assertEqual(schedule_utils._NOW_CACHE[0], 100.1 + ttl)
+
+    def test_get_dates_without_time(self):
+        """Return dict with two dates: now and the requested one."""
+        result = self.filter.get_dates("1970-01-01")
+        self.assertEqual(
+            result["check_date"],
+            datetime.strptime("1970-01-01", "%Y-%m-%d").date(),
+        )
+        self.assertEqual(
+            result["now_date"],
+            datetime.strptime(self.date_today, "%Y-%m-%d").date(),
+        )
+
+    def test_get_dates_with_time(self):
+        """Return dict with two dates: now and the requested one."""
+        # Removing the microseconds from this timestamp.
+        time_now = str(datetime.today().replace(microsecond=0))
+
+        # Test with a 'T' instead of a whitespace
+        result = self.filter.get_dates("1970-01-01T01:01:01")
+        self.assertEqual(
+            result["check_date"],
+            datetime.strptime("1970-01-01 01:01:01", "%Y-%m-%d %H:%M:%S"),
+        )
+        self.assertEqual(
+            result["now_date"],
+            datetime.strptime(time_now, "%Y-%m-%d %H:%M:%S"),
+        )
+
+        # Test with a space instead of a 'T'
+        result = self.filter.get_dates("1970-01-01T01:01:01")
+        self.assertEqual(
+            result["check_date"],
+            datetime.strptime("1970-01-01 01:01:01", "%Y-%m-%d %H:%M:%S"),
+        )
+
+        self.assertEqual(
+            result["now_date"],
+            datetime.strptime(time_now, "%Y-%m-%d %H:%M:%S"),
+        )
+
+    def test_get_dates_invalid(self):
+        """Raise ValueError for datestrings in an unsupported format."""
+        for datestring in (
+            "",
+            "1970-1-1",
+            "1970-01-01T01:01",
+            "1970-13-01",
+            "2022-12-11X10:11:12",
+            "2022/12/11",
+            # Non-ASCII decimal digits are rejected.
+            "\u0662\u0660\u0662\u0662-12-11",
+            "\uff12\uff10\uff12\uff12-12-11",
+        ):
+            with self.assertRaises(ValueError):
+                self.filter.get_dates(datestring)
+
+    def test_filter_names(self):
+        """Generated filters keep their own name for tracebacks and help()."""
+        for name, func in self.filter.filters().items():
+            self.assertEqual(func.__name__, name)
+            self.assertEqual(func.__qualname__, f"FilterModule.{name}")
+
+    def test_is_past(self):
+        """Verify correct output from is_past"""
+        self.assertTrue(self.filter.is_past(self.date_yesterday))
+        self.assertFalse(self.filter.is_past(self.date_today))
+        self.assertFalse(self.filter.is_past(self.date_tomorrow))
+
+    def test_is_past_wtime(self):
+        """Verify correct outout from is_past with time"""
+        self.assertFalse(self.filter.is_past(self.date_tomorrow_wt))
+        self.assertFalse(self.filter.is_past(self.date_today_wt))
+        self.assertTrue(self.filter.is_past(self.date_yesterday_wt))
+
+    def test_is_today_or_past(self):
+        """Verify correct output fromn is_today_an_past"""
+        self.assertTrue(self.filter.is_today_or_past(self.date_today))
+        self.assertTrue(self.filter.is_today_or_past(self.date_yesterday))
+        self.assertFalse(self.filter.is_today_or_past(self.date_tomorrow))
+
+    def test_is_today_or_past_wt(self):
+        """Verify correct output fromn is_today_an_past"""
+        self.assertTrue(self.filter.is_today_or_past(self.date_today_wt))
+        self.assertTrue(self.filter.is_today_or_past(self.date_yesterday_wt))
+        self.assertFalse(self.filter.is_today_or_past(self.date_tomorrow_wt))
+
+    def test_is_future(self):
+        """Verify correct output from future day"""
+        self.assertFalse(self.filter.is_future(self.date_today))
+        self.assertFalse(self.filter.is_future(self.date_yesterday))
+        self.assertTrue(self.filter.is_future(self.date_tomorrow))
+
+    def test_is_today_or_future(self):
+        """Verify correct output from today and future"""
+        self.assertTrue(self.filter.is_today_or_future(self.date_today))
+        self.assertFalse(self.filter.is_today_or_future(self.date_yesterday))
+        self.assertTrue(self.filter.is_today_or_future(self.date_tomorrow))
+
+    def test_is_future_wt(self):
+        """Verify correct output from future day with time"""
+        self.assertFalse(self.filter.is_future(self.date_today_wt))
+        self.assertFalse(self.filter.is_future(self.date_yesterday_wt))
+        self.assertTrue(self.filter.is_future(self.date_tomorrow_wt))
+
+    def test_is_today(self):
+        """Verify correct output from today only"""
+        self.assertTrue(self.filter.is_today(self.date_today))
+        self.assertFalse(self.filter.is_today(self.date_yesterday))
+        self.assertFalse(self.filter.is_today(self.date_tomorrow))
+
+    def test_is_today_wt(self):
+        """Verify correct output from today only"""
+        self.assertTrue(self.filter.is_today(self.date_today_wt))
+        self.assertFalse(self.filter.is_today(self.date_yesterday_wt))
+        self.assertFalse(self.filter.is_today(self.date_tomorrow_wt))
+
+    def test_is_due_eq(self):
+        """Verify the return for due with todays date."""
+        self.assertTrue(
+            self.filter.is_due(self.date_today, date_operator="==")
+        )
+        self.assertFalse(
+            self.filter.is_due(self.date_tomorrow, date_operator="==")
+        )
+        self.assertFalse(
+            self.filter.is_due(self.date_yesterday, date_operator="==")
+        )
+
+    def test_is_due_gt(self):
+        """Verify the return for due with greater than"""
+        self.assertFalse(
+            self.filter.is_due(self.date_today, date_operator=">")
+        )
+        self.assertFalse(
+            self.filter.is_due(self.date_tomorrow, date_operator=">")
+        )
+        self.assertTrue(
+            self.filter.is_due(self.date_yesterday, date_operator=">")
+        )
+
+    def test_is_due_ge(self):
+        """Verify the return for due with greater-equal than"""
+        self.assertTrue(
+            self.filter.is_due(self.date_today, date_operator=">=")
+        )
+        self.assertFalse(
+            self.filter.is_due(self.date_tomorrow, date_operator=">=")
+        )
+        self.assertTrue(
+            self.filter.is_due(self.date_yesterday, date_operator=">=")
+        )
+
+    def test_is_due_le(self):
+        """Verify the return for due with less-equal than"""
+        self.assertTrue(
+            self.filter.is_due(self.date_today, date_operator="<=")
+        )
+        self.assertTrue(
+            self.filter.is_due(self.date_tomorrow, date_operator="<=")
+        )
+        self.assertFalse(
+            self.filter.is_due(self.date_yesterday, date_operator="<=")
+        )
+
+    def test_is_due_lt(self):
+        """Verify the return for due with less than"""
+        self.assertFalse(
+            self.filter.is_due(self.date_today, date_operator="<")
+        )
+        self.assertTrue(
+            self.filter.is_due(self.date_tomorrow, date_operator="<")
+        )
+        self.assertFalse(
+            self.filter.is_due(self.date_yesterday, date_operator="<")
+        )
+
+    def test_is_due_ne(self):
+        """Verify the return for due with less than"""
+        self.assertFalse(
+            self.filter.is_due(self.date_today, date_operator="!=")
+        )
+        self.assertTrue(
+            self.filter.is_due(self.date_tomorrow, date_operator="!=")
+        )
+        self.assertTrue(
+            self.filter.is_due(self.date_yesterday, date_operator="!=")
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()